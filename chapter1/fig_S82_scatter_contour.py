@@ -13,6 +13,7 @@ of the entire set of SDSS Stripe 82 standard stars; cf. figure 1.6.
 #   For more information, see http://astroML.github.com
 #   To report a bug or issue, use the following forum:
 #    https://groups.google.com/forum/#!forum/astroml-general
+import numpy as np
 from matplotlib import pyplot as plt
 
 from astroML.plotting import scatter_contour
@@ -35,10 +36,15 @@ g = data['mmu_g']
 r = data['mmu_r']
 i = data['mmu_i']
 
+# single precision is plenty for binning the colors, and halves the
+# memory traffic of the histogram over the full catalog
+gr = (g - r).astype(np.float32)
+ri = (r - i).astype(np.float32)
+
 #------------------------------------------------------------
 # plot the results
 fig, ax = plt.subplots(figsize=(5, 3.75))
-scatter_contour(g - r, r - i, threshold=200, log_counts=True, ax=ax,
+scatter_contour(gr, ri, threshold=200, log_counts=True, ax=ax,
                 histogram2d_args=dict(bins=40),
                 plot_args=dict(marker=',', linestyle='none', color='black'),
                 contour_args=dict(cmap=plt.cm.bone))
@@ -17,7 +17,8 @@ distortion inherent to the mapping.
 #    https://groups.google.com/forum/#!forum/astroml-general
 import numpy as np
 from matplotlib import pyplot as plt
-from astroML.plotting import plot_tissot_ellipse
+from matplotlib.path import Path
+from matplotlib.patches import PathPatch
 
 #----------------------------------------------------------------------
 # This function adjusts matplotlib settings for a uniform feel in the textbook.
@@ -27,12 +28,33 @@ from astroML.plotting import plot_tissot_ellipse
 from astroML.plotting import setup_text_plots
 setup_text_plots(fontsize=8, usetex=False)
 
+
+def tissot_vertices(longitude, latitude, radius, Nverts=100):
+    """Vertices of Tissot ellipses, as drawn by plot_tissot_ellipse
+
+    Returns an array of shape (Nellipses, Nverts, 2) giving the
+    (longitude, latitude) of points around each ellipse.
+    """
+    longitude, latitude = np.broadcast_arrays(longitude, latitude)
+    longitude = longitude.reshape(-1, 1)
+    latitude = latitude.reshape(-1, 1)
+
+    theta = np.linspace(0, 2 * np.pi, Nverts)
+    return np.dstack([longitude + 0.5 * radius * np.cos(theta)
+                      / np.cos(latitude),
+                      latitude + 0.5 * radius * np.sin(theta)])
+
 #------------------------------------------------------------
 # generate a latitude/longitude grid
 circ_long = np.linspace(-np.pi, np.pi, 13)[1:-1]
 circ_lat = np.linspace(-np.pi / 2, np.pi / 2, 7)[1:-1]
 radius = 10 * np.pi / 180.
 
+# the ellipses are the same in each projection: build them once as a single
+# compound path, which each axes shares and draws in one call
+verts = tissot_vertices(circ_long[:, None], circ_lat, radius)
+ellipses = Path.make_compound_path_from_polys(verts)
+
 #------------------------------------------------------------
 # Plot the built-in projections
 plt.figure(figsize=(5, 4))
@@ -54,8 +76,7 @@ for (i, projection) in enumerate(['Hammer', 'Aitoff', 'Mollweide', 'Lambert']):
 
     ax.grid(True, which='minor')
 
-    plot_tissot_ellipse(circ_long[:, None], circ_lat, radius,
-                        ax=ax, fc='k', alpha=0.3, linewidth=0)
+    ax.add_patch(PathPatch(ellipses, fc='k', alpha=0.3, linewidth=0))
     ax.set_title('%s projection' % projection)
 
 plt.show()
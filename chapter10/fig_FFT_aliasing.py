@@ -39,6 +39,14 @@ def gaussian(x, a=1.0):
 def gaussian_FT(f, a=1.0):
     return np.sqrt(2 * np.pi * a ** 2) * np.exp(-2 * (np.pi * a * f) ** 2)
 
+
+def plot_arrows(ax, x, y):
+    """Draw vertical arrows from (x, 0) to (x, y) as a single artist"""
+    x, y = np.broadcast_arrays(x, y)
+    ax.quiver(x, np.zeros_like(x), np.zeros_like(x), y,
+              angles='xy', scale_units='xy', scale=1,
+              width=0.003, headwidth=5, headlength=7, headaxislength=7)
+
 #------------------------------------------------------------
 # Define our terms
 a = 1.0
@@ -71,9 +79,7 @@ for dt in (0.9, 1.5):
     ax = fig.add_subplot(221)
     ax.plot(t, h, '-k')
 
-    for ts in t_sample:
-        ax.annotate('', (ts, 0.5), (ts, 0), ha='center', va='center',
-                    arrowprops=dict(arrowstyle='->'))
+    plot_arrows(ax, t_sample, 0.5)
     ax.text(0.03, 0.95,
             ("Signal and Sampling Window\n" +
              r"Sampling Rate $\Delta t$"),
@@ -88,9 +94,7 @@ for dt in (0.9, 1.5):
     # second plot: frequency space
     ax = fig.add_subplot(222)
     ax.plot(f, H, '-k')
-    for fs in f_sample:
-        ax.annotate('', (fs, 1.5), (fs, 0), ha='center', va='center',
-                    arrowprops=dict(arrowstyle='->'))
+    plot_arrows(ax, f_sample, 1.5)
     ax.text(0.03, 0.95,
             ("FT of Signal and Sampling Window\n" +
              r"$\Delta f = 1 / \Delta t$"),
@@ -104,11 +108,8 @@ for dt in (0.9, 1.5):
 
     # third plot: windowed function
     ax = fig.add_subplot(223)
-    for (ts, hs) in zip(t_sample, h_sample):
-        if hs < 0.1:
-            continue
-        ax.annotate('', (ts, hs), (ts, 0), ha='center', va='center',
-                    arrowprops=dict(arrowstyle='->'))
+    visible = (h_sample >= 0.1)
+    plot_arrows(ax, t_sample[visible], h_sample[visible])
     ax.plot(t, h, ':k')
     ax.text(0.03, 0.95, "Sampled signal: pointwise\nmultiplication",
             ha='left', va='top', transform=ax.transAxes)
@@ -121,7 +122,7 @@ for dt in (0.9, 1.5):
 
     # fourth plot: convolved PSD
     ax = fig.add_subplot(224)
-    window = np.array([gaussian_FT(f - fs, a) for fs in f_sample])
+    window = gaussian_FT(f - f_sample[:, None], a)
     ax.plot(f, window.sum(0), '-k')
     if dt > 1:
         ax.plot(f, window.T, ':k')
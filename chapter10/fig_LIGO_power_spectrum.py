@@ -19,12 +19,14 @@ Welch's method of overlapping windows to smooth noise; the middle panel uses a
 #   For more information, see http://astroML.github.com
 #   To report a bug or issue, use the following forum:
 #    https://groups.google.com/forum/#!forum/astroml-general
+import os
+
 import numpy as np
 from matplotlib import pyplot as plt
-from scipy import fftpack
-from matplotlib import mlab
+from scipy.signal import welch
 
-from astroML.datasets import fetch_LIGO_large
+from astroML.datasets import fetch_LIGO_large, get_data_home
+from astroML.datasets.LIGO_bigdog import LOCAL_FILE_LARGE
 
 #----------------------------------------------------------------------
 # This function adjusts matplotlib settings for a uniform feel in the textbook.
@@ -34,39 +36,58 @@ from astroML.datasets import fetch_LIGO_large
 from astroML.plotting import setup_text_plots
 setup_text_plots(fontsize=8, usetex=False)
 
+#------------------------------------------------------------
+# FFT cost varies strongly between neighboring lengths; this finds the
+# longest length not exceeding n which factors into 2s, 3s and 5s.
+def prev_fast_len(n):
+    best = 1
+    p5 = 1
+    while p5 <= n:
+        p35 = p5
+        while p35 <= n:
+            p235 = p35 << ((n // p35).bit_length() - 1)
+            best = max(best, p235)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
 #------------------------------------------------------------
 # Fetch the LIGO hanford data
-data, dt = fetch_LIGO_large()
+#  fetch_LIGO_large keeps the parsed data as a binary array in the astroML
+#  data directory; it is only called to download that file on the first run.
+#  The array is then memory-mapped rather than read into memory up front.
+LIGO_file = os.path.join(get_data_home(), LOCAL_FILE_LARGE)
+if not os.path.exists(LIGO_file):
+    fetch_LIGO_large()
+
+data = np.load(LIGO_file, mmap_mode='r')
+dt = 1. / 4096  # the data are sampled at 4096 Hz
 
 # subset of the data to plot
 t0 = 646
 T = 2
-tplot = dt * np.arange(T * 4096)
-dplot = data[4096 * t0: 4096 * (t0 + T)]
-
-tplot = tplot[::10]
-dplot = dplot[::10]
+tplot = dt * np.arange(0, T * 4096, 10)
+dplot = data[4096 * t0: 4096 * (t0 + T): 10]
 
 fmin = 40
 fmax = 2060
 
 #------------------------------------------------------------
 # compute PSD using simple FFT
-N = len(data)
+#  truncate the data to a length for which the FFT is fast
+N = prev_fast_len(len(data))
 df = 1. / (N * dt)
-PSD = abs(dt * fftpack.fft(data)[:N / 2]) ** 2
-f = df * np.arange(N / 2)
 
-cutoff = ((f >= fmin) & (f <= fmax))
-f = f[cutoff]
-PSD = PSD[cutoff]
-f = f[::100]
-PSD = PSD[::100]
+# keep every 100th frequency between fmin and fmax (or the Nyquist limit)
+k = np.arange(int(np.ceil(fmin / df)), min(int(fmax / df), N // 2) + 1, 100)
+f = df * k
+PSD = abs(dt * np.fft.rfft(data[:N])[k]) ** 2
 
 #------------------------------------------------------------
 # compute PSD using Welch's method -- no window function
-PSDW1, fW1 = mlab.psd(data, NFFT=4096, Fs=1. / dt,
-                      window=mlab.window_none, noverlap=2048)
+fW1, PSDW1 = welch(data, fs=1. / dt, window='boxcar', nperseg=4096,
+                   noverlap=2048, detrend=False)
 
 dfW1 = fW1[1] - fW1[0]
 
@@ -76,8 +97,8 @@ PSDW1 = PSDW1[cutoff]
 
 #------------------------------------------------------------
 # compute PSD using Welch's method -- hanning window function
-PSDW2, fW2 = mlab.psd(data, NFFT=4096, Fs=1. / dt,
-                      window=mlab.window_hanning, noverlap=2048)
+fW2, PSDW2 = welch(data, fs=1. / dt, window='hann', nperseg=4096,
+                   noverlap=2048, detrend=False)
 
 dfW2 = fW2[1] - fW2[0]
 
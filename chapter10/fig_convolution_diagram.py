@@ -23,8 +23,6 @@ function.
 import numpy as np
 from matplotlib import pyplot as plt
 
-from scipy.signal import fftconvolve
-
 #----------------------------------------------------------------------
 # This function adjusts matplotlib settings for a uniform feel in the textbook.
 # Note that with usetex=True, fonts are rendered with LaTeX.  This may
@@ -40,11 +38,17 @@ warnings.filterwarnings('ignore')
 
 #------------------------------------------------------------
 # Generate random x, y with a given covariance length
+#  The covariance is stationary, so rather than factoring the full matrix
+#  we embed its first row in a circulant matrix, which is diagonalized by
+#  the FFT, and draw the sample in Fourier space.
 np.random.seed(1)
 x = np.linspace(0, 1, 500)
 h = 0.01
-C = np.exp(-0.5 * (x - x[:, None]) ** 2 / h ** 2)
-y = 0.8 + 0.3 * np.random.multivariate_normal(np.zeros(len(x)), C)
+c = np.exp(-0.5 * (x - x[0]) ** 2 / h ** 2)
+c = np.concatenate([c, c[-2:0:-1]])
+lam = np.fft.fft(c).real.clip(0)
+z = np.random.normal(size=len(c)) + 1j * np.random.normal(size=len(c))
+y = 0.8 + 0.3 * np.fft.fft(np.sqrt(lam / len(c)) * z).real[:len(x)]
 
 #------------------------------------------------------------
 # Define a normalized top-hat window function
@@ -52,24 +56,33 @@ w = np.zeros_like(x)
 w[(x > 0.12) & (x < 0.28)] = 1
 
 #------------------------------------------------------------
-# Perform the convolution
-y_norm = np.convolve(np.ones_like(y), w, mode='full')
+# Compute the Fourier transforms of the signal and window.  The inputs are
+# real, and zero-padding to the full convolution length means the product
+# of the transforms gives the convolution plotted below.
+N_full = 2 * len(x) - 1
+y_fft = np.fft.rfft(y, N_full)
+w_fft = np.fft.rfft(w, N_full)
+
+yw_fft = y_fft * w_fft
+yw_final = np.fft.irfft(yw_fft, N_full)
+
+#------------------------------------------------------------
+# Normalize the convolution
+#  convolving a constant with the window is a running sum of the window,
+#  so the normalization can be computed without a convolution.
+n = np.arange(N_full)
+w_cumsum = np.concatenate([[0], np.cumsum(w)])
+y_norm = (w_cumsum[np.minimum(n + 1, len(w))]
+          - w_cumsum[np.maximum(n + 1 - len(w), 0)])
 valid_indices = (y_norm != 0)
 y_norm = y_norm[valid_indices]
 
-y_w = np.convolve(y, w, mode='full')[valid_indices] / y_norm
+y_w = yw_final[valid_indices] / y_norm
 
 # trick: convolve with x-coordinate to find the center of the window at
 #        each point.
-x_w = np.convolve(x, w, mode='full')[valid_indices] / y_norm
-
-#------------------------------------------------------------
-# Compute the Fourier transforms of the signal and window
-y_fft = np.fft.fft(y)
-w_fft = np.fft.fft(w)
-
-yw_fft = y_fft * w_fft
-yw_final = np.fft.ifft(yw_fft)
+x_w = np.fft.irfft(np.fft.rfft(x, N_full) * w_fft, N_full)
+x_w = x_w[valid_indices] / y_norm
 
 #------------------------------------------------------------
 # Set up the plots
@@ -120,11 +133,14 @@ ax.set_ylim(0, 1.99)
 
 #----------------------------------------
 # plot the Fourier transforms
-N = len(x)
-k = - 0.5 * N + np.arange(N) * 1. / N / (x[1] - x[0])
+#  the inputs are real, so the transforms are symmetric about k = 0
+def mirror(a, sign=1):
+    return np.concatenate([sign * a[:0:-1], a])
+
+k = mirror(np.fft.rfftfreq(N_full, x[1] - x[0]), sign=-1)
 
 ax = fig.add_subplot(422)
-ax.plot(k, abs(np.fft.fftshift(y_fft)), '-k')
+ax.plot(k, mirror(abs(y_fft)), '-k')
 
 ax.text(0.95, 0.95, r'$\mathcal{F}(D)$',
         ha='right', va='top', transform=ax.transAxes)
@@ -136,7 +152,7 @@ ax.xaxis.set_major_formatter(plt.NullFormatter())
 ax.yaxis.set_major_formatter(plt.NullFormatter())
 
 ax = fig.add_subplot(424)
-ax.plot(k, abs(np.fft.fftshift(w_fft)), '-k')
+ax.plot(k, mirror(abs(w_fft)), '-k')
 
 ax.text(0.95, 0.95,  r'$\mathcal{F}(W)$', ha='right', va='top',
         transform=ax.transAxes)
@@ -150,7 +166,7 @@ ax.yaxis.set_major_formatter(plt.NullFormatter())
 #----------------------------------------
 # plot the product of Fourier transforms
 ax = fig.add_subplot(224)
-ax.plot(k, abs(np.fft.fftshift(yw_fft)), '-k')
+ax.plot(k, mirror(abs(yw_fft)), '-k')
 
 ax.text(0.95, 0.95, ('Pointwise\nproduct:\n' +
                      r'$\mathcal{F}(D) \cdot \mathcal{F}(W)$'),
@@ -19,11 +19,7 @@ MCMC and shown in the other panels.
 import numpy as np
 from matplotlib import pyplot as plt
 
-# Hack to fix import issue in older versions of pymc
-import scipy
-import scipy.misc
-scipy.derivative = scipy.misc.derivative
-import pymc
+from scipy import optimize
 
 from astroML.plotting.mcmc import plot_mcmc
 from astroML.decorators import pickle_results
@@ -40,7 +36,9 @@ setup_text_plots(fontsize=8, usetex=False)
 #----------------------------------------------------------------------
 # Set up toy dataset
 def chirp(t, b0, beta, A, omega):
-    return b0 + A * np.sin(omega * t + beta * t * t)
+    # the phase in Horner form, with the sine computed in place
+    phase = t * (omega + beta * t)
+    return b0 + A * np.sin(phase, out=phase)
 
 np.random.seed(0)
 
@@ -63,51 +61,133 @@ i = np.argsort(t)
 
 #----------------------------------------------------------------------
 # Set up MCMC sampling
-b0 = pymc.Uniform('b0', 0, 50, value=50 * np.random.random())
-A = pymc.Uniform('A', 0, 50, value=50 * np.random.random())
-log_beta = pymc.Uniform('log_beta', -10, 10, value=-4.6)
-log_omega = pymc.Uniform('log_omega', -10, 10, value=-2.3)
-
-
-# uniform prior on log(beta)
-@pymc.deterministic
-def beta(log_beta=log_beta):
-    return np.exp(log_beta)
-
-
-# uniform prior on log(omega)
-@pymc.deterministic
-def omega(log_omega=log_omega):
-    return np.exp(log_omega)
-
-
-@pymc.deterministic
-def y_model(t=t, b0=b0, A=A, beta=beta, omega=omega):
-    return chirp(t, b0, beta, A, omega)
-
-y = pymc.Normal('y', mu=y_model, tau=sigma ** -2, observed=True, value=y_obs)
-
-model = dict(b0=b0, A=A,
-             log_beta=log_beta, beta=beta,
-             log_omega=log_omega, omega=omega,
-             y_model=y_model, y=y)
+#  The parameters are x = (b0, A, log_beta, log_omega), with uniform priors
+#  on b0 and A and on log(beta) and log(omega).
+x_lower = np.array([0, 0, -10, -10])
+x_upper = np.array([50, 50, 10, 10])
+
+
+def log_posterior(x):
+    """Log-posterior for an array of parameter vectors of shape (..., 4)"""
+    b0, A, log_beta, log_omega = np.moveaxis(x, -1, 0)[..., None]
+    y_model = chirp(t, b0, np.exp(log_beta), A, np.exp(log_omega))
+    logp = -0.5 * np.sum(((y_obs - y_model) / sigma) ** 2, -1)
+    in_bounds = np.all((x >= x_lower) & (x <= x_upper), -1)
+    return np.where(in_bounds, logp, -np.inf)
+
+
+def metropolis_hastings(log_post, x0, step, niter, burn, n_adapt=500,
+                        depth=2):
+    """Adaptive random-walk Metropolis-Hastings sampler
+
+    x0 has shape (n_chains, n_dim): the chains are run side by side, so
+    each step evaluates the posterior for all chains in a single call.
+    The proposal is a multivariate normal with diagonal standard deviations
+    ``step``.  During the burn-in, the proposal covariance is re-estimated
+    from the chains every ``n_adapt`` steps; afterward it is held fixed.
+    Returns the (niter - burn, n_chains, n_dim) trace after the burn-in.
+
+    The next ``depth`` steps are computed speculatively: every proposal
+    reachable by some sequence of accepts and rejects (2 ** depth - 1 of
+    them) is evaluated in one call to log_post, and the chain then walks
+    down the tree of accept/reject decisions.  The resulting chain is
+    identical to taking the steps one at a time.
+    """
+    x = np.array(x0, dtype=float)
+    n_chains, ndim = x.shape
+    L = np.diag(step)
+    chains = np.arange(n_chains)
+
+    # draw all the random numbers up front
+    z = np.random.normal(size=(niter, n_chains, ndim))
+    log_u = np.log(np.random.random((niter, n_chains)))
+
+    trace = np.empty((niter, n_chains, ndim))
+    logp = log_post(x)
+
+    i = 0
+    next_adapt = n_adapt
+    while i < niter:
+        if i == next_adapt and i < burn:
+            # pooled within-chain covariance of the second half so far
+            d = trace[i // 2:i] - trace[i // 2:i].mean(0)
+            cov = np.dot(d.reshape(-1, ndim).T, d.reshape(-1, ndim))
+            cov /= d.shape[0] * n_chains - 1
+            L = np.linalg.cholesky(2.38 ** 2 / ndim
+                                   * (cov + 1E-12 * np.eye(ndim)))
+            next_adapt += n_adapt
+
+        # don't let the tree cross the next adaptation step
+        k = min(depth, niter - i)
+        if i < burn:
+            k = min(k, next_adapt - i)
+
+        # states[p] is the state reached by the accept (1) / reject (0)
+        # decisions given by the binary digits of p
+        states = x[None]
+        proposals = []
+        for j in range(k):
+            proposal = states + np.dot(z[i + j], L.T)
+            proposals.append(proposal)
+            states = np.stack([states, proposal], 1).reshape(-1, n_chains,
+                                                             ndim)
+        proposals = np.concatenate(proposals)
+        logp_proposals = log_post(proposals)
+
+        # walk down the tree: the proposal for path p at level j is stored
+        # at index 2 ** j - 1 + p
+        path = np.zeros(n_chains, dtype=int)
+        for j in range(k):
+            ind = 2 ** j - 1 + path
+            logp_new = logp_proposals[ind, chains]
+            accept = (log_u[i + j] < logp_new - logp)
+            x[accept] = proposals[ind, chains][accept]
+            logp[accept] = logp_new[accept]
+            path = 2 * path + accept
+            trace[i + j] = x
+
+        i += k
+
+    return trace[burn:]
+
+
+def gelman_rubin(trace):
+    """Potential scale reduction factor R_hat of each parameter
+
+    trace has shape (n_steps, n_chains, n_dim).  Values near 1 indicate
+    that the chains have converged to the same distribution.
+    """
+    n = trace.shape[0]
+    W = trace.var(0, ddof=1).mean(0)
+    B = n * trace.mean(0).var(0, ddof=1)
+    return np.sqrt(((n - 1.) / n * W + B / n) / W)
 
 
 #----------------------------------------------------------------------
 # Run the MCMC sampling (saving results to a pickle)
-@pickle_results('matchedfilt_chirp.pkl')
-def compute_MCMC_results(niter=20000, burn=2000):
-    S = pymc.MCMC(model)
-    S.sample(iter=niter, burn=burn)
-    traces = [S.trace(s)[:] for s in ['b0', 'A', 'omega', 'beta']]
+@pickle_results('matchedfilt_chirp_mcmc.pkl')
+def compute_MCMC_results(niter=20000, burn=2000, n_chains=4):
+    x0 = np.zeros((n_chains, 4))
+    x0[:, :2] = 50 * np.random.random((n_chains, 2))
+    x0[:, 2:] = [-4.6, -2.3]
+
+    trace = metropolis_hastings(log_posterior, x0, [0.5, 0.5, 0.001, 0.01],
+                                niter, burn)
+    R_hat = gelman_rubin(trace)
+
+    trace = trace.reshape(-1, 4)
+    traces = [trace[:, 0], trace[:, 1],
+              np.exp(trace[:, 3]), np.exp(trace[:, 2])]
 
-    M = pymc.MAP(model)
-    M.fit()
-    fit_vals = (M.b0.value, M.beta.value, M.A.value, M.omega.value)
+    # maximum a posteriori fit, starting from the posterior mean
+    b0, A, log_beta, log_omega = optimize.fmin(lambda x: -log_posterior(x),
+                                               trace.mean(0), disp=False)
+    fit_vals = (b0, np.exp(log_beta), A, np.exp(log_omega))
 
-    return traces, fit_vals
+    return traces, fit_vals, R_hat
 
-traces, fit_vals = compute_MCMC_results()
+traces, fit_vals, R_hat = compute_MCMC_results()
+print("Gelman-Rubin R_hat:", R_hat)
 
 labels = ['$b_0$', '$A$', r'$\omega$', r'$\beta$']
 limits = [(9.5, 11.3), (3.6, 6.4), (0.065, 0.115), (0.00975, 0.01045)]
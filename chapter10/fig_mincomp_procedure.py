@@ -26,8 +26,9 @@ in astroML.filters.min_component_filter
 import numpy as np
 from matplotlib import pyplot as plt
 
-from scipy import fftpack
+from scipy import fft
 
+from astroML.decorators import pickle_results
 from astroML.fourier import PSD_continuous
 from astroML.datasets import fetch_sdss_spectrum
 
@@ -45,10 +46,14 @@ plate = 659
 mjd = 52199
 fiber = 381
 
-data = fetch_sdss_spectrum(plate, mjd, fiber)
 
-lam = data.wavelength()
-spec = data.spectrum
+# save the spectrum locally, so that re-running doesn't need to fetch it
+@pickle_results('sdss_%i_%i_%i.pkl' % (plate, mjd, fiber))
+def fetch_spectrum(plate, mjd, fiber):
+    data = fetch_sdss_spectrum(plate, mjd, fiber)
+    return data.wavelength(), data.spectrum
+
+lam, spec = fetch_spectrum(plate, mjd, fiber)
 
 # wavelengths are logorithmically spaced: we'll work in log(lam)
 loglam = np.log10(lam)
@@ -70,30 +75,40 @@ feature_mask = (((lam > 4080) & (lam < 4130)) |
 
 #----------------------------------------------------------------------
 # Second step: fit a line to the unmasked portion of the spectrum
-XX = loglam[:, None] ** np.arange(2)
-beta = np.linalg.lstsq(XX[~feature_mask], spec[~feature_mask])[0]
-
-spec_fit = np.dot(XX, beta)
+#  for a straight line the 2x2 normal equations can be solved directly;
+#  working about the mean of x keeps them well-conditioned.
+x_fit = loglam[~feature_mask]
+y_fit = spec[~feature_mask]
+x_mean = x_fit.mean()
+dx_fit = x_fit - x_mean
+slope = np.dot(dx_fit, y_fit) / np.dot(dx_fit, dx_fit)
+beta = [y_fit.mean() - slope * x_mean, slope]
+
+spec_fit = beta[0] + beta[1] * loglam
 spec_patched = spec - spec_fit
 spec_patched[feature_mask] = 0
 
 #----------------------------------------------------------------------
 # Third step: Fourier transform the patched spectrum
+#  the spectrum is real, so we need only the non-negative frequencies
 N = len(loglam)
-df = 1. / N / (loglam[1] - loglam[0])
-f = fftpack.ifftshift(df * (np.arange(N) - N / 2.))
-spec_patched_FT = fftpack.fft(spec_patched)
+f = fft.rfftfreq(N, loglam[1] - loglam[0])
+spec_patched_FT = fft.rfft(spec_patched)
 
 #----------------------------------------------------------------------
 # Fourth step: Low-pass filter on the transform
-filt = np.exp(- (0.01 * (abs(f) - 100.)) ** 2)
-filt[abs(f) < 100] = 1
+#  flat below f = 100, with a gaussian roll-off above
+filt = np.exp(- (0.01 * np.maximum(f - 100., 0)) ** 2)
 
-spec_filt_FT = spec_patched_FT * filt
+# only the amplitude of the unfiltered transform is needed later, so keep
+# that and apply the filter in place
+spec_patched_amp = abs(spec_patched_FT)
+spec_filt_FT = spec_patched_FT
+spec_filt_FT *= filt
 
 #----------------------------------------------------------------------
 # Fifth step: inverse Fourier transform, and add back the fit
-spec_filt = fftpack.ifft(spec_filt_FT)
+spec_filt = fft.irfft(spec_filt_FT, N)
 spec_filt += spec_fit
 
 #----------------------------------------------------------------------
@@ -112,14 +127,11 @@ ax.set_ylabel('flux')
 
 ax = fig.add_subplot(212)
 factor = 15 * (loglam[1] - loglam[0])
-ax.plot(fftpack.fftshift(f),
-        factor * fftpack.fftshift(abs(spec_patched_FT) ** 1),
+ax.plot(f, factor * spec_patched_amp,
         '-', c='gray', label='masked/shifted spectrum')
-ax.plot(fftpack.fftshift(f),
-        factor * fftpack.fftshift(abs(spec_filt_FT) ** 1),
+ax.plot(f, factor * abs(spec_filt_FT),
         '-k', label='filtered spectrum')
-ax.plot(fftpack.fftshift(f),
-        fftpack.fftshift(filt), '--k', label='filter')
+ax.plot(f, filt, '--k', label='filter')
 
 ax.set_xlim(0, 2000)
 ax.set_ylim(0, 1.1)
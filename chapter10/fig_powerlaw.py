@@ -22,6 +22,7 @@ References
 #    https://groups.google.com/forum/#!forum/astroml-general
 import numpy as np
 from matplotlib import pyplot as plt
+from astroML.decorators import pickle_results
 from astroML.time_series import generate_power_law
 from astroML.fourier import PSD_continuous
 
@@ -37,16 +38,33 @@ N = 1024
 dt = 0.01
 factor = 100
 
-t = dt * np.arange(N)
-random_state = np.random.RandomState(1)
+
+#------------------------------------------------------------
+# Generate the light curves and compute their PSDs
+#  The results are saved, so that re-drawing the figure does not need
+#  to regenerate them.
+@pickle_results('powerlaw.pkl')
+def compute_light_curves(N, dt, betas, factor, rseed=1):
+    random_state = np.random.RandomState(rseed)
+    t = dt * np.arange(N)
+
+    results = []
+    for beta in betas:
+        x = factor * generate_power_law(N, dt, beta,
+                                        random_state=random_state)
+        f, PSD = PSD_continuous(t, x)
+
+        # single precision is plenty for plotting, and halves the storage
+        results.append((x.astype(np.float32), f, PSD.astype(np.float32)))
+    return t, results
+
+betas = (1.0, 2.0)
+t, results = compute_light_curves(N, dt, betas, factor)
 
 fig = plt.figure(figsize=(5, 3.75))
 fig.subplots_adjust(wspace=0.05)
 
-for i, beta in enumerate([1.0, 2.0]):
-    # Generate the light curve and compute the PSD
-    x = factor * generate_power_law(N, dt, beta, random_state=random_state)
-    f, PSD = PSD_continuous(t, x)
+for i, (beta, (x, f, PSD)) in enumerate(zip(betas, results)):
 
     # First axes: plot the time series
     ax1 = fig.add_subplot(221 + i)
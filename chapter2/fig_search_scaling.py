@@ -6,7 +6,8 @@
 #   For more information, see http://astroML.github.com
 #   To report a bug or issue, use the following forum:
 #    https://groups.google.com/forum/#!forum/astroml-general
-from time import time
+import gc
+from time import perf_counter
 import numpy as np
 from matplotlib import pyplot as plt
 
@@ -18,34 +19,56 @@ from matplotlib import pyplot as plt
 from astroML.plotting import setup_text_plots
 setup_text_plots(fontsize=8, usetex=False)
 
+#------------------------------------------------------------
+# Linear search: scan the array from the start, stopping at the first match.
+#  Comparing the whole array at once (e.g. np.where(x == item)) would always
+#  touch all N elements, so the array is scanned in fixed-size blocks.
+def linear_search(x, item, blocksize=2 ** 16):
+    for start in range(0, len(x), blocksize):
+        match = np.flatnonzero(x[start:start + blocksize] == item)
+        if len(match) > 0:
+            return start + match[0]
+    return -1
+
+
 #------------------------------------------------------------
 # Compute the execution times as a function of array size
 Nsamples = 10 ** np.linspace(6.0, 7.8, 17)
 time_linear = np.zeros_like(Nsamples)
 time_binary = np.zeros_like(Nsamples)
 
+# create the largest sorted array once; each size uses a leading slice of
+# it.  Filling it up front also means the memory is already paged in, so
+# the first timings don't include the cost of faulting it in.
+x_all = np.arange(int(Nsamples[-1]), dtype=int)
+
+# the garbage collector is paused so that it can't run inside a timing
+gc.disable()
+
 for i in range(len(Nsamples)):
-    # create a sorted array
-    x = np.arange(Nsamples[i], dtype=int)
+    # take a sorted array of this size
+    x = x_all[:int(Nsamples[i])]
 
     # Linear search: choose a single item in the array
     item = int(0.4 * Nsamples[i])
 
-    t0 = time()
-    j = np.where(x == item)
-    t1 = time()
+    t0 = perf_counter()
+    j = linear_search(x, item)
+    t1 = perf_counter()
 
     time_linear[i] = t1 - t0
 
     # Binary search: this is much faster, so choose 1000 items to search for
     items = np.linspace(0, Nsamples[i], 1000).astype(int)
 
-    t0 = time()
-    j = np.searchsorted(x, items)
-    t1 = time()
+    t0 = perf_counter()
+    j = np.searchsorted(x, items, side='left')
+    t1 = perf_counter()
 
     time_binary[i] = (t1 - t0)
 
+gc.enable()
+
 #------------------------------------------------------------
 # Plot the results
 fig = plt.figure(figsize=(5, 3.75))
@@ -15,7 +15,9 @@ setup_text_plots(fontsize=8, usetex=False)
 n_values = [20, 20, 40]
 b_values = [0.2, 0.6, 0.6]
 linestyles = ['-', '--', ':']
-x = np.arange(-1, 200)
+
+# evaluate only over the plotted range; x = -1 gives the line down to zero
+x = np.arange(-1, 36)
 
 #------------------------------------------------------------
 # plot the distributions
@@ -21,10 +21,11 @@ x = np.linspace(-10, 10, 1000)
 # plot the distributions
 fig, ax = plt.subplots(figsize=(5, 3.75))
 
-for gamma, ls in zip(gamma_values, linestyles):
-    dist = cauchy(mu, gamma)
+# evaluate all the distributions at once by broadcasting over the gammas
+pdfs = cauchy.pdf(x[:, None], mu, gamma_values)
 
-    plt.plot(x, dist.pdf(x), ls=ls, color='black',
+for gamma, pdf, ls in zip(gamma_values, pdfs.T, linestyles):
+    plt.plot(x, pdf, ls=ls, color='black',
              label=r'$\mu=%i,\ \gamma=%.1f$' % (mu, gamma))
 
 plt.xlim(-4.5, 4.5)
@@ -21,11 +21,11 @@ x = np.linspace(-10, 10, 1000)
 # plot the distributions
 fig, ax = plt.subplots(figsize=(5, 3.75))
 
-for sigma, ls in zip(sigma_values, linestyles):
-    # create a gaussian / normal distribution
-    dist = norm(mu, sigma)
+# evaluate all the distributions at once by broadcasting over the sigmas
+pdfs = norm.pdf(x[:, None], mu, sigma_values)
 
-    plt.plot(x, dist.pdf(x), ls=ls, c='black',
+for sigma, pdf, ls in zip(sigma_values, pdfs.T, linestyles):
+    plt.plot(x, pdf, ls=ls, c='black',
              label=r'$\mu=%i,\ \sigma=%.1f$' % (mu, sigma))
 
 plt.xlim(-5, 5)
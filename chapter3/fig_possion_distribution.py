@@ -1,5 +1,5 @@
 import numpy as np
-from scipy.stats import poisson
+from scipy.special import gammaln
 from matplotlib import pyplot as plt
 
 #----------------------------------------------------------------------
@@ -15,24 +15,23 @@ setup_text_plots(fontsize=8, usetex=False)
 mu_values = [1, 5, 15]
 linestyles = ['-', '--', ':']
 
+# evaluate only over the plotted range; x = -1 gives the line down to zero
+x = np.arange(-1, 31)
+
+# log(x!) is the same for every mu, so compute it once
+logfact = gammaln(x + 1)
+
 #------------------------------------------------------------
 # plot the distributions
-#   we generate it using scipy.stats.poisson().  Once the distribution
-#   object is created, we have many options: for example
-#   - dist.pmf(x) evaluates the probability mass function in the case of
-#     discrete distributions.
-#   - dist.pdf(x) evaluates the probability density function for
-#   evaluates
+#   the pmf is evaluated in log space, log p = x log(mu) - mu - log(x!).
+#   The same curves can be computed with scipy.stats.poisson(mu).pmf(x).
 fig, ax = plt.subplots(figsize=(5, 3.75))
 
 for mu, ls in zip(mu_values, linestyles):
-    # create a poisson distribution
-    # we could generate a random sample from this distribution using, e.g.
-    #   rand = dist.rvs(1000)
-    dist = poisson(mu)
-    x = np.arange(-1, 200)
+    pmf = np.exp(x * np.log(mu) - mu - logfact)
+    pmf[x < 0] = 0
 
-    plt.plot(x, dist.pmf(x), ls=ls, color='black',
+    plt.plot(x, pmf, ls=ls, color='black',
              label=r'$\mu=%i$' % mu)
 
 plt.xlim(-0.5, 30)
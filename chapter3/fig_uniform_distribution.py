@@ -1,5 +1,4 @@
 import numpy as np
-from scipy.stats import uniform
 from matplotlib import pyplot as plt
 
 #----------------------------------------------------------------------
@@ -22,10 +21,12 @@ x = np.linspace(-2, 2, 1000)
 fig, ax = plt.subplots(figsize=(5, 3.75))
 
 for W, ls in zip(W_values, linestyles):
+    # the pdf is 1 / W on [mu - W/2, mu + W/2], and zero elsewhere; this
+    # is the same as scipy.stats.uniform(mu - W / 2, W).pdf(x)
     left = mu - 0.5 * W
-    dist = uniform(left, W)
+    pdf = np.where((x >= left) & (x <= left + W), 1. / W, 0)
 
-    plt.plot(x, dist.pdf(x), ls=ls, c='black',
+    plt.plot(x, pdf, ls=ls, c='black',
              label=r'$\mu=%i,\ W=%i$' % (mu, W))
 
 plt.xlim(-1.7, 1.7)
@@ -23,6 +23,7 @@ of the cumulative (integrated) posterior probability, allows solutions with
 import numpy as np
 from matplotlib import pyplot as plt
 from astroML.plotting.mcmc import convert_to_stdev
+from astroML.decorators import pickle_results
 
 #----------------------------------------------------------------------
 # This function adjusts matplotlib settings for a uniform feel in the textbook.
@@ -40,8 +41,15 @@ def gaussgauss_logL(xi, ei, mu, sigma):
     xi = xi.reshape(xi.shape + tuple(ndim * [1]))
     ei = ei.reshape(ei.shape + tuple(ndim * [1]))
 
-    s2_e2 = sigma ** 2 + ei ** 2
-    return -0.5 * np.sum(np.log(s2_e2) + (xi - mu) ** 2 / s2_e2, 0)
+    # the weights w = 1 / (sigma^2 + e_i^2) don't depend on mu, so expand
+    # sum(w * (x_i - mu)^2) in powers of mu: the sums over the data are
+    # then done before broadcasting against mu, and no (N x grid) array
+    # is ever formed.
+    w = 1. / (sigma ** 2 + ei ** 2)
+    W0 = w.sum(0)
+    W1 = (w * xi).sum(0)
+    W2 = (w * xi ** 2).sum(0)
+    return -0.5 * (W2 - 2 * mu * W1 + mu ** 2 * W0 - np.log(w).sum(0))
 
 #------------------------------------------------------------
 # Define the grid and compute logL
@@ -55,8 +63,16 @@ xi = np.random.normal(mu_true, np.sqrt(sigma_true ** 2 + ei ** 2))
 sigma = np.linspace(0.01, 5, 70)
 mu = np.linspace(-3, 5, 70)
 
-logL = gaussgauss_logL(xi, ei, mu, sigma[:, np.newaxis])
-logL -= logL.max()
+
+# save the likelihood and its conversion to sigma levels, so that the
+# figure can be re-drawn without recomputing them
+@pickle_results('gaussgauss_logL.pkl')
+def compute_logL(xi, ei, mu, sigma):
+    logL = gaussgauss_logL(xi, ei, mu, sigma[:, np.newaxis])
+    logL -= logL.max()
+    return logL, convert_to_stdev(logL)
+
+logL, logL_stdev = compute_logL(xi, ei, mu, sigma)
 
 #------------------------------------------------------------
 # plot the results
@@ -74,7 +90,7 @@ plt.text(0.5, 0.93,
          bbox=dict(ec='k', fc='w', alpha=0.9),
          ha='center', va='center', transform=plt.gca().transAxes)
 
-plt.contour(mu, sigma, convert_to_stdev(logL),
+plt.contour(mu, sigma, logL_stdev,
             levels=(0.683, 0.955, 0.997),
             colors='k')
 
@@ -20,6 +20,7 @@ distributions.
 import numpy as np
 from matplotlib import pyplot as plt
 from scipy.stats import cauchy
+from scipy.special import logsumexp
 from astroML.stats import median_sigmaG
 from astroML.resample import bootstrap
 
@@ -41,13 +42,31 @@ def cauchy_logL(x, gamma, mu):
     shape = np.broadcast(gamma, mu).shape
     x = x.reshape(x.shape + tuple([1 for s in shape]))
 
-    return ((n - 1) * np.log(gamma)
-            - np.sum(np.log(gamma ** 2 + (x - mu) ** 2), 0))
+    # gamma ** 2 + (x - mu) ** 2 is the only array with the full shape;
+    # take its log in place rather than allocating another
+    logsum = gamma ** 2 + (x - mu) ** 2
+    np.log(logsum, out=logsum)
+
+    return (n - 1) * np.log(gamma) - logsum.sum(0)
 
 
 def estimate_mu_gamma(xi, axis=None):
     """Equation 3.54: Cauchy point estimates"""
-    q25, q50, q75 = np.percentile(xi, [25, 50, 75], axis=axis)
+    # the quartiles are found by sorting once and interpolating linearly
+    # between order statistics, as np.percentile does.  For the many short
+    # bootstrap samples this is several times faster than np.percentile.
+    if axis is None:
+        xi, axis = np.ravel(xi), 0
+    xi = np.sort(xi, axis)
+    n = xi.shape[axis]
+
+    def quantile(q):
+        j = q * (n - 1)
+        lower = np.take(xi, int(j), axis)
+        upper = np.take(xi, min(int(j) + 1, n - 1), axis)
+        return lower + (j % 1) * (upper - lower)
+
+    q25, q50, q75 = quantile(0.25), quantile(0.5), quantile(0.75)
     return q50, 0.5 * (q75 - q25)
 
 
@@ -67,12 +86,16 @@ dgamma = gamma[1] - gamma[0]
 mu = np.linspace(-3, 3, 70)
 dmu = mu[1] - mu[0]
 
-likelihood = np.exp(cauchy_logL(xi, gamma[:, np.newaxis], mu))
+# marginalize in log space, which avoids forming the full likelihood
+# grid and can't underflow however wide the grid is
+logL = cauchy_logL(xi, gamma[:, np.newaxis], mu)
 
-pmu = likelihood.sum(0)
+log_pmu = logsumexp(logL, 0)
+pmu = np.exp(log_pmu - log_pmu.max())
 pmu /= pmu.sum() * dmu
 
-pgamma = likelihood.sum(1)
+log_pgamma = logsumexp(logL, 1)
+pgamma = np.exp(log_pgamma - log_pgamma.max())
 pgamma /= pgamma.sum() * dgamma
 
 #------------------------------------------------------------
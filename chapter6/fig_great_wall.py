@@ -27,7 +27,6 @@ from matplotlib.colors import LogNorm
 from scipy.spatial import cKDTree
 
 from astroML.datasets import fetch_great_wall
-from astroML.density_estimation import KDE, KNeighborsDensity
 
 #----------------------------------------------------------------------
 # This function adjusts matplotlib settings for a uniform feel in the textbook.
@@ -53,17 +52,30 @@ ymin, ymax = (-300, 200)
 
 #------------------------------------------------------------
 # Evaluate for several models
-Xgrid = np.vstack(map(np.ravel, np.meshgrid(np.linspace(xmin, xmax, Nx),
-                                            np.linspace(ymin, ymax, Ny)))).T
+ygrid, xgrid = np.mgrid[ymin:ymax:Ny * 1j, xmin:xmax:Nx * 1j]
+Xgrid = np.column_stack([xgrid.ravel(), ygrid.ravel()])
 
-kde = KDE(metric='gaussian', h=5)
-dens_KDE = kde.fit(X).eval(Xgrid).reshape((Ny, Nx))
+# Gaussian KDE: the kernel falls below 1E-7 of its peak beyond 6h, so only
+# pairs closer than that are found (with a pair of trees) and summed
+def gaussian_kde(X, Xgrid, h, cutoff=6):
+    pairs = cKDTree(Xgrid).sparse_distance_matrix(cKDTree(X), cutoff * h,
+                                                  output_type='ndarray')
+    K = np.exp(-0.5 * (pairs['v'] / h) ** 2)
+    dens = np.bincount(pairs['i'], K, minlength=len(Xgrid))
+    return dens / (2 * np.pi * h ** 2 * len(X))
 
-knn5 = KNeighborsDensity('bayesian', 5)
-dens_k5 = knn5.fit(X).eval(Xgrid).reshape((Ny, Nx))
+dens_KDE = gaussian_kde(X, Xgrid, h=5).reshape((Ny, Nx))
 
-knn40 = KNeighborsDensity('bayesian', 40)
-dens_k40 = knn40.fit(X).eval(Xgrid).reshape((Ny, Nx))
+# k-neighbors densities: build one tree and find the 40 nearest neighbors
+# of each grid point; the k=5 estimate uses the first five of these.
+# The Bayesian estimate is the same as KNeighborsDensity('bayesian', k).
+def knn_density(dist, k):
+    return k * (k + 1) * 0.5 / np.pi / (dist[:, :k] ** 2).sum(1)
+
+dist, ind = cKDTree(X).query(Xgrid, 40)
+
+dens_k5 = knn_density(dist, 5).reshape((Ny, Nx))
+dens_k40 = knn_density(dist, 40).reshape((Ny, Nx))
 
 #------------------------------------------------------------
 # Plot the results
@@ -73,7 +85,7 @@ fig.subplots_adjust(left=0.12, right=0.95, bottom=0.2, top=0.9,
 
 # First plot: scatter the points
 ax1 = plt.subplot(221, aspect='equal')
-ax1.scatter(X[:, 1], X[:, 0], s=1, lw=0, c='k')
+ax1.plot(X[:, 1], X[:, 0], 'ok', ms=1, mew=0)
 ax1.text(0.95, 0.9, "input", ha='right', va='top',
          transform=ax1.transAxes,
          bbox=dict(boxstyle='round', ec='k', fc='w'))
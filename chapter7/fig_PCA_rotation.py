@@ -19,6 +19,7 @@ perpendicular distances between the points and the principal components.
 import numpy as np
 from matplotlib import pyplot as plt
 from matplotlib.patches import Ellipse
+from matplotlib.collections import LineCollection, PatchCollection
 
 #----------------------------------------------------------------------
 # This function adjusts matplotlib settings for a uniform feel in the textbook.
@@ -68,18 +69,18 @@ ax.annotate(r'$y^\prime$', (r * s, -r * c), (-r * s, r * c),
 # scatter points
 ax.scatter(X[0], X[1], s=25, lw=0, c='k', zorder=2)
 
-# draw lines
+# draw lines from each point to its projection onto the x' axis
 vnorm = np.array([s, -c])
-for v in (X.T):
-    d = np.dot(v, vnorm)
-    v1 = v - d * vnorm
-    ax.plot([v[0], v1[0]], [v[1], v1[1]], '-k')
+d = np.dot(X.T, vnorm)
+X1 = X.T - d[:, None] * vnorm
+ax.add_collection(LineCollection(np.stack([X.T, X1], 1), colors='k'))
 
 # draw ellipses
-for sigma in (1, 2, 3):
-    ax.add_patch(Ellipse((0, 0), 2 * sigma * sigma1, 2 * sigma * sigma2,
-                         rotation * 180. / np.pi,
-                         ec='k', fc='gray', alpha=0.2, zorder=1))
+ellipses = [Ellipse((0, 0), 2 * sigma * sigma1, 2 * sigma * sigma2,
+                    angle=rotation * 180. / np.pi)
+            for sigma in (1, 2, 3)]
+ax.add_collection(PatchCollection(ellipses, edgecolors='k', facecolors='gray',
+                                  alpha=0.2, zorder=1))
 
 ax.set_xlim(-1, 1)
 ax.set_ylim(-1, 1)
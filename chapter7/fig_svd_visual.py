@@ -23,6 +23,7 @@ the right-singular vectors. The columns are orthonormal bases, and satisfy
 import numpy as np
 from matplotlib import pyplot as plt
 from matplotlib.patches import Rectangle
+from matplotlib.collections import LineCollection
 
 #----------------------------------------------------------------------
 # This function adjusts matplotlib settings for a uniform feel in the textbook.
@@ -44,30 +45,26 @@ def labeled_rect(ax, center, width, height, text,
             fontsize=14, ha='center', va='center',
             bbox=dict(ec=color, fc=color))
 
+    x0, x1 = center[0] - 0.5 * width, center[0] + 0.5 * width
+    y0, y1 = center[1] - 0.5 * height, center[1] + 0.5 * height
+
+    # build the stripes as line segments, and draw them as one collection
     if stripe == 'vert':
-        xlocs = np.linspace(center[0] - 0.5 * width,
-                            center[0] + 0.5 * width,
-                            N + 2)[1:-1]
-        for x in xlocs:
-            plt.plot([x, x],
-                     [center[1] - 0.5 * height,
-                      center[1] + 0.5 * height], '-k')
+        xlocs = np.linspace(x0, x1, N + 2)[1:-1]
+        segments = [[(x, y0), (x, y1)] for x in xlocs]
 
     elif stripe == 'horiz':
-        ylocs = np.linspace(center[1] - 0.5 * height,
-                            center[1] + 0.5 * height,
-                            N + 2)[1:-1]
-        for y in ylocs:
-            plt.plot([center[0] - 0.5 * width,
-                      center[0] + 0.5 * width],
-                     [y, y], '-k')
+        ylocs = np.linspace(y0, y1, N + 2)[1:-1]
+        segments = [[(x0, y), (x1, y)] for y in ylocs]
 
     elif stripe == 'diag':
-        plt.plot([center[0] - 0.5 * width, center[0] + 0.5 * width],
-                 [center[1] + 0.5 * height, center[1] - 0.5 * height], '-k')
+        segments = [[(x0, y1), (x1, y0)]]
     else:
         raise ValueError("unrecognized stripe type")
 
+    ax.add_collection(LineCollection(segments, colors='k',
+                                     capstyle='projecting'))
+
 #------------------------------------------------------------
 # Plot the results
 fig = plt.figure(figsize=(5, 2.5))
@@ -20,7 +20,7 @@ posterior cuts off half the parameter space.
 #    https://groups.google.com/forum/#!forum/astroml-general
 import numpy as np
 from matplotlib import pyplot as plt
-from astroML.plotting.mcmc import convert_to_stdev
+from astroML.decorators import pickle_results
 
 #----------------------------------------------------------------------
 # This function adjusts matplotlib settings for a uniform feel in the textbook.
@@ -30,6 +30,30 @@ from astroML.plotting.mcmc import convert_to_stdev
 from astroML.plotting import setup_text_plots
 setup_text_plots(fontsize=8, usetex=False)
 
+
+def convert_to_stdev_stack(logL):
+    """Convert a stack of log-likelihood grids to cumulative standard deviation
+
+    This is astroML.plotting.mcmc.convert_to_stdev applied to each of the
+    2-D grids logL[0], logL[1], ..., with all the grids sorted in one call.
+    """
+    if np.ndim(logL) != 3:
+        raise ValueError("logL must be a stack of 2-D grids")
+
+    sigma = np.exp(logL).reshape(len(logL), -1)
+
+    # sort each flattened grid in decreasing order
+    i_sort = np.argsort(sigma, -1)[:, ::-1]
+
+    sigma_cumsum = np.take_along_axis(sigma, i_sort, -1).cumsum(-1)
+    sigma_cumsum /= sigma_cumsum[:, -1:]
+
+    # and scatter the cumulative sums back to the unsorted positions
+    result = np.empty_like(sigma_cumsum)
+    np.put_along_axis(result, i_sort, sigma_cumsum, -1)
+
+    return result.reshape(np.shape(logL))
+
 #------------------------------------------------------------
 # Set up the data and errors
 np.random.seed(13)
@@ -50,11 +74,40 @@ y4 = a * x4 + b + 0.2
 # Compute the likelihoods for each point
 a_range = np.linspace(0, 2, 80)
 b_range = np.linspace(-1, 1, 80)
-logL = -((a_range[:, None, None] * x + b_range[None, :, None] - y) / dy) ** 2
-sigma = [convert_to_stdev(logL[:, :, i]) for i in range(3)]
+
+# region excluded by the fourth point: a * x4 + b > y4, i.e. b is above
+# a cutoff which depends only on a
+b_cutoff = y4 - x4 * a_range
+mask = b_range[None, :] > b_cutoff[:, None]
+
+
+# save the likelihoods and their conversions to sigma levels, so that the
+# figures can be re-drawn without recomputing them
+@pickle_results('linreg_likelihoods.pkl')
+def compute_likelihoods(x, y, dy, mask, a_range, b_range):
+    logL = [-((a_range[:, None] * x[k] + b_range - y[k]) / dy[k]) ** 2
+            for k in range(3)]
+
+    # running sums of the likelihoods: logL_cumulative[k] combines the
+    # first k + 1 points, and the last also applies the fourth point
+    logL_cumulative = [logL[0]]
+    for logL_k in logL[1:]:
+        logL_cumulative.append(logL_cumulative[-1] + logL_k)
+    logL_cumulative.append(np.where(mask, -np.inf, logL_cumulative[-1]))
+
+    # convert all the grids at once; logL_cumulative[0] is logL[0], so
+    # only the later running sums need their own sigma levels
+    stdev = convert_to_stdev_stack(np.array(logL + logL_cumulative[1:]))
+    sigma = stdev[:3]
+    sigma_together = stdev[3:]
+
+    return logL_cumulative, sigma, sigma_together
+
+logL_cumulative, sigma, sigma_together = compute_likelihoods(x, y, dy, mask,
+                                                             a_range, b_range)
 
 # compute best-fit from first three points
-logL_together = logL.sum(-1)
+logL_together = logL_cumulative[2]
 i, j = np.where(logL_together == np.max(logL_together))
 amax = a_range[i[0]]
 bmax = b_range[j[0]]
@@ -98,20 +151,12 @@ for i in range(4):
                     cmap=plt.cm.binary, alpha=0.5)
 
 # plot the excluded area from the fourth point
-axpb = a_range[:, None] * x4 + b_range[None, :]
-mask = y4 < axpb
-fig2.axes[3].fill_between(a_range, y4 - x4 * a_range, 2, color='k', alpha=0.5)
+fig2.axes[3].fill_between(a_range, b_cutoff, 2, color='k', alpha=0.5)
 
 # plot ellipses
 for i in range(1, 4):
     ax = fig2.axes[i]
-    logL_together = logL[:, :, :i + 1].sum(-1)
-    if i == 3:
-        logL_together[mask] = -np.inf
-
-    sigma_together = convert_to_stdev(logL_together)
-
-    ax.contour(a_range, b_range, sigma_together.T,
+    ax.contour(a_range, b_range, sigma_together[i - 1].T,
                levels=(0.683, 0.955, 0.997),
                colors='k')
 
@@ -19,10 +19,8 @@ examples in Hogg, Bovy & Lang 2010.
 import numpy as np
 from scipy import optimize
 from matplotlib import pyplot as plt
-from matplotlib.patches import Ellipse
+from matplotlib.collections import EllipseCollection
 
-from astroML.linear_model import TLS_logL
-from astroML.plotting.mcmc import convert_to_stdev
 from astroML.datasets import fetch_hogg2010test
 
 #----------------------------------------------------------------------
@@ -37,43 +35,70 @@ setup_text_plots(fontsize=8, usetex=False)
 #------------------------------------------------------------
 # Define some convenience functions
 
-# translate between typical slope-intercept representation,
-# and the normal vector representation
-def get_m_b(beta):
-    b = np.dot(beta, beta) / beta[1]
-    m = -beta[0] / beta[1]
-    return m, b
+# TLS_logL written directly in terms of the slope m and intercept b of the
+# line.  For the normal vector beta = b * (-m, 1) / (1 + m^2), the squared
+# offset over the projected variance reduces to (y - m x - b)^2 / V, with
+# V = Syy - 2 m Sxy + m^2 Sxx, and the projected variance itself is
+# V / (1 + m^2).  m and b broadcast against each other.
+def TLS_logL_mb(m, b, x, y, Sxx, Sxy, Syy):
+    m = np.asarray(m)[..., None]
+    b = np.asarray(b)[..., None]
 
+    V = Syy - 2 * m * Sxy + m * m * Sxx
+    r = y - m * x - b
 
-def get_beta(m, b):
-    denom = (1 + m * m)
-    return np.array([-b * m / denom, b / denom])
+    return -0.5 * np.sum(np.log(2 * np.pi * V / (1 + m * m)) + r ** 2 / V, -1)
+
+
+# gradient of TLS_logL_mb with respect to (m, b)
+def TLS_logL_mb_grad(m, b, x, y, Sxx, Sxy, Syy):
+    m = np.asarray(m)[..., None]
+    b = np.asarray(b)[..., None]
+
+    V = Syy - 2 * m * Sxy + m * m * Sxx
+    r = y - m * x - b
+    dV = 2 * (m * Sxx - Sxy)
+
+    dlogL_dm = -0.5 * np.sum(dV / V - 2 * m / (1 + m * m)
+                             - (2 * r * x + r ** 2 * dV / V) / V, -1)
+    dlogL_db = np.sum(r / V, -1)
+    return np.array([dlogL_dm, dlogL_db])
+
+
+# logL values enclosing the given fractions of the total likelihood.
+# Contouring logL at these traces the same curves as contouring
+# convert_to_stdev(logL) at the fractions, without mapping the cumulative
+# likelihood back onto the whole grid.
+def stdev_levels(logL, fractions):
+    logL_sorted = np.sort(logL, axis=None)[::-1]
+    L_cumsum = np.exp(logL_sorted - logL_sorted[0]).cumsum()
+    L_cumsum /= L_cumsum[-1]
+    return np.interp(fractions, L_cumsum, logL_sorted)
 
 
 # compute the ellipse pricipal axes and rotation from covariance
-def get_principal(sigma_x, sigma_y, rho_xy):
-    sigma_xy2 = rho_xy * sigma_x * sigma_y
+def get_principal(Sxx, Sxy, Syy):
+    dS = Sxx - Syy
 
-    alpha = 0.5 * np.arctan2(2 * sigma_xy2,
-                             (sigma_x ** 2 - sigma_y ** 2))
-    tmp1 = 0.5 * (sigma_x ** 2 + sigma_y ** 2)
-    tmp2 = np.sqrt(0.25 * (sigma_x ** 2 - sigma_y ** 2) ** 2 + sigma_xy2 ** 2)
+    alpha = 0.5 * np.arctan2(2 * Sxy, dS)
+    tmp1 = 0.5 * (Sxx + Syy)
+    tmp2 = np.hypot(0.5 * dS, Sxy)
 
     return np.sqrt(tmp1 + tmp2), np.sqrt(tmp1 - tmp2), alpha
 
 
 # plot ellipses
-def plot_ellipses(x, y, sigma_x, sigma_y, rho_xy, factor=2, ax=None):
+def plot_ellipses(x, y, Sxx, Sxy, Syy, factor=2, ax=None):
     if ax is None:
         ax = plt.gca()
 
-    sigma1, sigma2, alpha = get_principal(sigma_x, sigma_y, rho_xy)
+    sigma1, sigma2, alpha = get_principal(Sxx, Sxy, Syy)
 
-    for i in range(len(x)):
-        ax.add_patch(Ellipse((x[i], y[i]),
-                             factor * sigma1[i], factor * sigma2[i],
-                             alpha[i] * 180. / np.pi,
-                             fc='none', ec='k'))
+    ax.add_collection(EllipseCollection(factor * sigma1, factor * sigma2,
+                                       alpha * 180. / np.pi, units='xy',
+                                       offsets=np.column_stack([x, y]),
+                                       transOffset=ax.transData,
+                                       facecolors='none', edgecolors='k'))
 
 #------------------------------------------------------------
 # We'll use the data from table 1 of Hogg et al. 2010
@@ -87,15 +112,20 @@ rho_xy = data['rho_xy']
 
 #------------------------------------------------------------
 # Find best-fit parameters
-X = np.vstack((x, y)).T
-dX = np.zeros((len(x), 2, 2))
-dX[:, 0, 0] = sigma_x ** 2
-dX[:, 1, 1] = sigma_y ** 2
-dX[:, 0, 1] = dX[:, 1, 0] = rho_xy * sigma_x * sigma_y
+Sxx = sigma_x ** 2
+Syy = sigma_y ** 2
+Sxy = rho_xy * sigma_x * sigma_y
 
-min_func = lambda beta: -TLS_logL(beta, X, dX)
-beta_fit = optimize.fmin(min_func,
-                         x0=[-1, 1])
+tls_logL = lambda m, b: TLS_logL_mb(m, b, x, y, Sxx, Sxy, Syy)
+tls_logL_grad = lambda m, b: TLS_logL_mb_grad(m, b, x, y, Sxx, Sxy, Syy)
+
+# the likelihood is smooth in (m, b), so a quasi-Newton method using the
+# analytic gradient converges in far fewer evaluations than Nelder-Mead.
+# The ordinary least-squares line (ignoring errors) is a cheap starting point.
+m_fit, b_fit = optimize.minimize(lambda p: -tls_logL(*p),
+                                 x0=np.polyfit(x, y, 1),
+                                 jac=lambda p: -tls_logL_grad(*p),
+                                 method='BFGS').x
 
 #------------------------------------------------------------
 # Plot the data and fits
@@ -107,11 +137,10 @@ fig.subplots_adjust(left=0.1, right=0.95, wspace=0.25,
 # first let's visualize the data
 ax = fig.add_subplot(121)
 ax.scatter(x, y, c='k', s=9)
-plot_ellipses(x, y, sigma_x, sigma_y, rho_xy, ax=ax)
+plot_ellipses(x, y, Sxx, Sxy, Syy, ax=ax)
 
 #------------------------------------------------------------
 # plot the best-fit line
-m_fit, b_fit = get_m_b(beta_fit)
 x_fit = np.linspace(0, 300, 10)
 ax.plot(x_fit, m_fit * x_fit + b_fit, '-k')
 
@@ -125,15 +154,11 @@ ax.set_ylabel('$y$')
 ax = fig.add_subplot(122)
 m = np.linspace(1.7, 2.8, 100)
 b = np.linspace(-60, 110, 100)
-logL = np.zeros((len(m), len(b)))
-
-for i in range(len(m)):
-    for j in range(len(b)):
-        logL[i, j] = TLS_logL(get_beta(m[i], b[j]), X, dX)
+logL = tls_logL(m[:, None], b)
 
-ax.contour(m, b, convert_to_stdev(logL.T),
-           levels=(0.683, 0.955, 0.997),
-           colors='k')
+ax.contour(m, b, logL.T,
+           levels=stdev_levels(logL, (0.997, 0.955, 0.683)),
+           colors='k', linestyles='solid')
 ax.set_xlabel('slope')
 ax.set_ylabel('intercept')
 ax.set_xlim(1.7, 2.8)
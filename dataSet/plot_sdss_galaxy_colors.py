@@ -23,10 +23,12 @@ import pandas as pd
 # Download data
 data = pd.read_csv("../Skyserver_SQL12-17-2017 8-08-16 AM.csv")
 
-# Extract colors and spectral class
-ug = data['u'] - data['g']
-gr = data['g'] - data['r']
-spec_class = data['camcol']
+# Extract colors and spectral class as plain arrays, so the arithmetic and
+# masking below skip pandas' index handling
+u, g, r = (data[c].to_numpy() for c in 'ugr')
+ug = u - g
+gr = g - r
+spec_class = data['camcol'].to_numpy()
 
 stars = (spec_class == 4)
 qsos = (spec_class == 5)
@@ -14,18 +14,30 @@ the SDSS CASjobs server for the colors of the 50,000 galaxies.
 # Author: Jake VanderPlas <vanderplas@astro.washington.edu>
 # License: BSD
 #   The figure is an example from astroML: see http://astroML.github.com
+import os
+
 import numpy as np
 from matplotlib import pyplot as plt
 
 from sklearn.neighbors import KNeighborsRegressor
 
+from astroML.decorators import pickle_results
 from astroML.datasets import fetch_sdss_galaxy_colors
 from astroML.plotting import scatter_contour
 import pandas as pd
 
 n_neighbors = 1
 
-data = pd.read_csv("Skyserver_SQL12-17-2017 8-08-16 AM.csv")
+# Parsing the CSV is slow compared to reading a binary array, so the
+# magnitudes and redshifts are saved after the first run.  The saved array
+# is keyed on the file, its modification time and the columns read.
+@pickle_results('sdss_ugriz_redshift.pkl')
+def load_catalog(filename, columns, mtime):
+    return pd.read_csv(filename, usecols=columns)[columns].to_numpy()
+
+catalog_file = "Skyserver_SQL12-17-2017 8-08-16 AM.csv"
+columns = ['u', 'g', 'r', 'i', 'z', 'redshift']
+data = load_catalog(catalog_file, columns, os.path.getmtime(catalog_file))
 
 N = data.shape[0]
 
@@ -33,13 +45,11 @@ N = data.shape[0]
 np.random.seed(0)
 #np.random.shuffle(data)
 
-# put colors in a matrix
-X = np.zeros((N, 4))
-X[:, 0] = data['u'] - data['g']
-X[:, 1] = data['g'] - data['r']
-X[:, 2] = data['r'] - data['i']
-X[:, 3] = data['i'] - data['z']
-z = data['redshift']
+# put colors in a matrix: each color is the difference of adjacent
+# magnitudes, so take them all at once from the ugriz block
+mags = data[:, :5]
+X = mags[:, :-1] - mags[:, 1:]
+z = data[:, 5]
 
 #data_u = data['u']/np.mean(data['u'])
 #data_g = data['g']/np.mean(data['g'])
@@ -59,16 +69,19 @@ ztrain = z[:Ntrain]
 Xtest = X[Ntrain:]
 ztest = z[Ntrain:]
 
-knn = KNeighborsRegressor(n_neighbors, weights='uniform')
+knn = KNeighborsRegressor(n_neighbors, weights='uniform',
+                          algorithm='kd_tree')
 zpred = knn.fit(Xtrain, ztrain).predict(Xtest)
 
 axis_lim = np.array([-0.1, 2.5])
 
-rms = np.sqrt(np.mean((ztest - zpred) ** 2))
+# sum of squared residuals as a single dot product
+dz = ztest - zpred
+rms = np.sqrt(np.dot(dz, dz) / len(dz))
 print("RMS error = %.2g" % rms)
 
 ax = plt.axes()
-plt.scatter(ztest, zpred, c='k', lw=0, s=4)
+plt.plot(ztest, zpred, 'ok', ms=2, mew=0)
 plt.plot(axis_lim, axis_lim, '--k')
 plt.plot(axis_lim, axis_lim + rms, ':k')
 plt.plot(axis_lim, axis_lim - rms, ':k')